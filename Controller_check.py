@@ -1,13 +1,22 @@
+import csv
+import logging
+import os
+import queue
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
+
 import numpy as np
-import pandas as pd
 from pathlib import Path
+from typing import NamedTuple
 
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QColor
 from PyQt6.QtWidgets import QVBoxLayout, QWidget, QFileDialog
 from fontTools.varLib.interpolatable import DEFAULT_KINKINESS
-from osgeo import gdal
-from collections import defaultdict
+from osgeo import gdal, gdal_array
 
 from qfluentwidgets import CommandBar, FluentIcon as FIF, RoundMenu, setFont, Action, LineEdit, \
     TransparentPushButton, BodyLabel
@@ -17,9 +26,119 @@ from qfluentwidgets import CommandBar, FluentIcon as FIF, RoundMenu, setFont, Ac
 # --------------------------------------------------------------------------------------------------------------------------------
 
 
+# GDAL全局配置（须在任何Open之前设置）
+# 打开影像时不列举同级目录（避免每次Open都扫描整个文件夹）
+gdal.SetConfigOption("GDAL_DISABLE_READDIR_ON_OPEN", "EMPTY_DIR")
+# 延迟加载TIFF分块偏移表，只在真正读块时才读取
+gdal.SetConfigOption("GTIFF_USE_DEFER_STRILE_LOADING", "YES")
+# 单个数据集内部不再开解码线程（并行由影像级线程池负责，避免线程数相乘导致过度订阅）
+gdal.SetConfigOption("GDAL_NUM_THREADS", "1")
+# GDAL块缓存上限512MB（多线程并发读取时限制总内存占用）
+gdal.SetCacheMax(512 * 1024 * 1024)
 # 启用异常处理
 gdal.UseExceptions()
 
+# 传感器类型/角度取值（驻留字符串：解析结果与缺失判断共用同一对象，比较时可走指针相等的快速路径）
+PAN = sys.intern("全色")
+MS = sys.intern("多光谱")
+HR = sys.intern("高分辨")
+BACK = sys.intern("后视")
+FRONT = sys.intern("前视")
+DOWN = sys.intern("下视")
+
+# 模块日志：逐影像的进度/匹配等高频信息走DEBUG级别，默认不输出，避免热循环中频繁print
+log = logging.getLogger(__name__)
+
+# 影像后缀（统一小写，匹配时文件名先转小写，.TIF/.Tiff等同样命中）
+TIF_SUFFIXES = (".tif", ".tiff")
+
+# 0值占比检查改用金字塔（概视图）采样：影像自带金字塔时，读取像素数不少于
+# OVERVIEW_MIN_PIXELS 的最小一级代替全分辨率。
+# 注意：只有写在TIFF内部的金字塔会被用到——上面的GDAL_DISABLE_READDIR_ON_OPEN=EMPTY_DIR
+# 让GDAL找不到外部的.ovr/.rrd金字塔文件（ArcGIS/ENVI生成的GF/ZY产品多为这种），这类影像仍按全分辨率统计。
+# 默认开启后，带内部金字塔的影像「是否损坏」由精确判定变为近似判定；需逐像素精确统计时设为False
+ZERO_RATIO_USE_OVERVIEWS = True
+OVERVIEW_MIN_PIXELS = 10000
+
+# 质量检查线程数（GDAL读块时释放GIL，IO/解码可多核并行）
+# 上限8：读取以磁盘IO为主，每个线程各占一份块缓冲区并分摊GDAL块缓存，线程再多只会加剧磁盘寻道争抢
+QUALITY_WORKERS = min(8, os.cpu_count() or 1)
+
+def _scandir_recursive(path: str):
+    """
+    基于 os.scandir 的递归生成器：单次遍历目录树，逐个产出文件的 DirEntry
+    （DirEntry 自带类型缓存，避免 rglob 的重复 stat；无权限读取的文件夹跳过并告警，
+    与 rglob 一致，不影响其余文件夹的遍历）
+    参数：
+        path: 待遍历的文件夹路径（字符串）
+    返回：
+        文件 DirEntry 的生成器
+    """
+    try:
+        it = os.scandir(path)
+    except PermissionError as e:
+        log.warning("[警告] 无权限访问文件夹，已跳过：%s（%s）", path, e)
+        return
+    with it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _scandir_recursive(entry.path)
+            elif entry.is_file(follow_symlinks=False):
+                yield entry
+
+
+def _scan_source(source_path: str) -> tuple[list[str], tuple[dict[str, str], dict[str, str]]]:
+    """
+    单次遍历源文件夹，按后缀分拣出TIF文件路径，同时建立RPC/RPB文件名索引
+    （整个运行只列举一次目录树，网络存储上不再重复扫描）
+    参数：
+        source_path: 源文件夹路径（字符串）
+    返回：
+        all_tif: 所有 .tif/.tiff 文件路径列表（后缀匹配不区分大小写）
+        rpc_index: (rpc_files, rpb_files)，文件名 → 文件路径
+            （{影像名}.rpc / {影像名}_rpc.txt、{影像名}.rpb / {影像名}_rpb.txt）
+    说明：
+        RPC/RPB索引同时收录原始文件名和去掉"_rpc"/"_rpb"后缀的文件名，
+        与原匹配规则（文件名==影像名 或 文件名==影像名+"_rpc"）完全等价
+    """
+    all_tif: list[str] = []
+    rpc_files: dict[str, str] = {}
+    rpb_files: dict[str, str] = {}
+    file_count = {"_rpc": 0, "_rpb": 0}
+    # 无权限的子文件夹由_scandir_recursive逐个跳过并告警，其余文件夹照常分拣
+    for entry in _scandir_recursive(source_path):
+        name = entry.name.lower()
+        if name.endswith(TIF_SUFFIXES):
+            all_tif.append(entry.path)
+            continue
+        if name.endswith(".rpc") or name.endswith("_rpc.txt"):
+            files, tail = rpc_files, "_rpc"
+        elif name.endswith(".rpb") or name.endswith("_rpb.txt"):
+            files, tail = rpb_files, "_rpb"
+        else:
+            continue
+        file_count[tail] += 1
+        stem = os.path.splitext(entry.name)[0]
+        # 同名时保留先遍历到的文件
+        files.setdefault(stem, entry.path)
+        if stem.endswith(tail):
+            files.setdefault(stem[:-len(tail)], entry.path)
+
+    log.info("【RPC索引】共找到 %d 个RPC文件、%d 个RPB文件", file_count["_rpc"], file_count["_rpb"])
+    return all_tif, (rpc_files, rpb_files)
+
+
+def build_rpc_index(source_path: str) -> tuple[dict[str, str], dict[str, str]]:
+    """
+    建立RPC/RPB文件名索引（单独调用main时使用；完整流程由search_source在搜索TIF的同一次遍历中建好）
+    参数：
+        source_path: 源文件夹路径（字符串）
+    返回：
+        rpc_files, rpb_files: 文件名 → 文件路径（见_scan_source）
+    """
+    return _scan_source(source_path)[1]
+
+
 def search_tif(source_path: str) -> list[str]:
     """
     递归搜索指定路径下所有 .tif 和 .tiff 文件（返回字符串格式路径，兼容gdal）
@@ -28,6 +147,17 @@ def search_tif(source_path: str) -> list[str]:
     返回：
         所有TIF文件的绝对路径列表（字符串）
     """
+    return search_source(source_path)[0]
+
+
+def search_source(source_path: str) -> tuple[list[str], tuple[dict[str, str], dict[str, str]]]:
+    """
+    校验源文件夹后单次遍历：搜索所有TIF文件，并顺带建立RPC/RPB文件名索引
+    参数：
+        source_path: 源文件夹路径（字符串）
+    返回：
+        所有TIF文件的绝对路径列表（字符串）、RPC/RPB文件名索引（见_scan_source）
+    """
     """递归搜索TIF文件，先校验路径合法性"""
     # 1. 转换为Path对象，便于后续操作（新增异常捕获）
     try:
@@ -59,10 +189,9 @@ def search_tif(source_path: str) -> list[str]:
             "请检查：① Windows：右键文件夹→属性→安全→添加当前用户的读写权限；② Linux：chmod +rwx 目录路径"
         )
 
-    # 5. 正常搜索TIF文件（新增子文件夹搜索权限异常捕获）
+    # 5. 单次遍历搜索TIF文件（.tif/.tiff 一并匹配，同时分拣RPC/RPB文件；新增子文件夹搜索权限异常捕获）
     try:
-        tif_files = [str(file) for file in source_dir.rglob("*.tif")]
-        tiff_files = [str(file) for file in source_dir.rglob("*.tiff")]
+        all_tif, rpc_index = _scan_source(str(source_dir))
     except PermissionError as e:
         raise PermissionError(
             f"【权限不足】搜索子文件夹时被拒绝：{str(e)}\n"
@@ -71,25 +200,57 @@ def search_tif(source_path: str) -> list[str]:
     except Exception as e:
         raise RuntimeError(f"【搜索错误】递归搜索TIF文件时出错：{str(e)}") from e
 
-    all_tif = tiff_files + tif_files
-
     # 6. 若未找到TIF，给出明确提示（而非静默处理）（原有逻辑保留）
     if not all_tif:
         raise FileNotFoundError(
             f"【无TIF文件】在文件夹 {source_dir} 及其子文件夹中未找到任何 .tif 或 .tiff 文件\n"
-            "请检查：① 影像文件是否放在该文件夹下；② 文件后缀是否为 .tif/.tiff（注意区分大小写，如.TIF需改为.tif）"
+            "请检查：① 影像文件是否放在该文件夹下；② 文件后缀是否为 .tif/.tiff（不区分大小写）"
         )
 
-    print(f"【搜索成功】找到 {len(all_tif)} 个TIF文件：{all_tif}")
-    return all_tif
+    log.info("【搜索成功】找到 %d 个TIF文件", len(all_tif))
+    log.debug("TIF文件列表：%s", all_tif)
+    return all_tif, rpc_index
+
+
+# 各卫星影像ID的提取规则（入参为按"_"分割后的文件名）
+def _id_gf(parts: tuple[str, ...]) -> str:
+    return parts[-1].partition("-")[0]  # 等价于原逻辑的 split('_')[-1].split('-')[0]，不生成中间列表
+
+
+def _id_gf7(parts: tuple[str, ...]) -> str:
+    return parts[-1]
+
+
+def _id_zy3(parts: tuple[str, ...]) -> str:
+    return f"{parts[2]}_{parts[3]}"
+
 
+def _id_sv(parts: tuple[str, ...]) -> str:
+    return parts[2]
 
-def get_tif_id(tif_name: str, sate_type: str) -> str:
+
+def _id_th01(parts: tuple[str, ...]) -> str:
+    return f"{parts[-2]}_{parts[-1]}"
+
+
+# 卫星类型 → 影像ID提取函数（模块加载时建好，查表分发代替if/elif链）
+TIF_ID_PARSERS = {
+    "GF1": _id_gf, "GF2": _id_gf, "GF6": _id_gf, "ZY1": _id_gf,
+    "GF7": _id_gf7,
+    "zy303a": _id_zy3, "zy302a": _id_zy3,
+    "SV1-03": _id_sv, "SV-2": _id_sv,
+    "TH01-01": _id_th01, "TH01-02": _id_th01, "TH01-03": _id_th01, "TH01-04": _id_th01,
+}
+
+
+@lru_cache(maxsize=4096)
+def get_tif_id(tif_name: str, sate_type: str, parts: tuple[str, ...] | None = None) -> str:
     """
-    根据卫星类型提取影像ID（严格保留原始业务逻辑）
+    根据卫星类型提取影像ID（严格保留原始业务逻辑；纯函数，结果按参数缓存）
     参数：
         tif_name: 不带后缀的影像文件名（如 "GF1_20230101_xxx"）
         sate_type: 卫星类型（如 "GF1", "zy3"）
+        parts: 调用方已按"_"分割好的文件名（可选，传入则不再重复分割）
     返回：
         影像ID（用于分组），异常时返回原文件名
     """
@@ -105,35 +266,35 @@ def get_tif_id(tif_name: str, sate_type: str) -> str:
     if not sate_type.strip():
         raise ValueError("[错误] sate_type 不能为空字符串")
 
-    parts = tif_name.split("_")  # 预分割，减少重复计算
+    parser = TIF_ID_PARSERS.get(sate_type)
+    if parser is None:
+        return tif_name  # 未知卫星类型，返回原文件名避免分组失败
     try:
-        if sate_type in ("GF1", "GF2", "GF6", "ZY1"):
-            return tif_name.split("_")[-1].split("-")[0]  # 等价于原逻辑的 split('_')[-1].split('-')[0]
-        elif sate_type == "GF7":
-            return parts[-1]
-        elif sate_type in ("zy303a","zy302a"):
-            return f"{parts[2]}_{parts[3]}"
-        elif sate_type in ("SV1-03", "SV-2"):
-            return parts[2]
-        elif sate_type in ("TH01-01","TH01-02","TH01-03","TH01-04"):
-            return f"{parts[-2]}_{parts[-1]}"
-        else:
-            return tif_name  # 未知卫星类型，返回原文件名避免分组失败
+        return parser(parts if parts is not None else tif_name.split("_"))
     except IndexError:
         # 文件名格式异常时，返回原文件名
-        print(f"[警告] 文件名 {tif_name} 格式异常，用原文件名作为ID")
+        log.warning("[警告] 文件名 %s 格式异常，用原文件名作为ID", tif_name)
         return tif_name
 
 
-def preprocess_tif(tif_names: list[str]) -> tuple[list[str], list[list[str]], list[list[str]]]:
+class TifRec(NamedTuple):
+    """单张影像的文件名解析结果（preprocess_tif中只解析一次，后续各环节直接复用）"""
+    stem: str  # 不带后缀的文件名（如 "GF1_20230101_xxx"）
+    parts: tuple[str, ...]  # 文件名按"_"分割的结果（元组，可直接作为缓存键）
+    path: str  # 影像文件路径
+    sate_type: str  # 卫星类型（parts[0]）
+    tif_id: str  # 影像ID（分组键）
+
+
+def preprocess_tif(tif_names: list[str], validate: bool = False) -> tuple[list[str], list[list[TifRec]]]:
     """
     预处理TIF文件：按「卫星类型→影像ID」二级分组（保留原始分组逻辑）
     参数：
         tif_names: 单张/多张TIF文件路径列表（search_tif返回值或单文件列表）
+        validate: 是否逐个检查路径存在（search_tif刚遍历出的路径无需再stat，默认不检查）
     返回：
         tif_satetypes: 分组对应的卫星类型列表（与分组一一对应）
-        tifs: 分组后的影像名称列表（每个元素是同一ID的影像名称集合）
-        tifs_path: 分组后的影像路径列表（每个元素是同一ID的影像路径集合）
+        tif_groups: 分组后的影像记录列表（每个元素是同一ID的TifRec集合）
     """
 
     # 新增：参数类型校验
@@ -142,460 +303,559 @@ def preprocess_tif(tif_names: list[str]) -> tuple[list[str], list[list[str]], li
     for idx, path in enumerate(tif_names):
         if not isinstance(path, str):
             raise TypeError(f"[错误] tif_names 列表中第{idx + 1}个元素必须是字符串路径，当前为 {type(path).__name__}")
-        if not Path(path).exists():
+        if validate and not os.path.exists(path):
             raise FileNotFoundError(f"[错误] tif_names 列表中第{idx + 1}个路径不存在：{path}")
 
-    # 第一步：提取每个TIF的核心信息（卫星类型、文件名、路径）
-    tif_info = []
+    # 第一步：解析每个TIF的文件名（整个流程只解析这一次，后续分组与元信息提取都复用TifRec）
+    # 第二步：按「卫星类型→影像ID」分组（单层字典，键为(卫星类型, 影像ID)，按首次出现顺序保存）
+    group_dict: dict[tuple[str, str], list[TifRec]] = {}
     for tif_path in tif_names:
-        path_obj = Path(tif_path)
-        tif_name = path_obj.stem  # 不带后缀的文件名（如 "GF1_20230101_xxx"）
-        sate_type = tif_name.split("_")[0]  # 卫星类型：按"_"分割，取第一部分
-        tif_info.append((sate_type, tif_name, tif_path))
-
-    # 第二步：按「卫星类型→影像ID」二级分组（用defaultdict简化逻辑）
-    # 一级键：卫星类型；二级键：影像ID；值：(tif_name, tif_path)列表
-    group_dict = defaultdict(lambda: defaultdict(list))
-    for sate_type, tif_name, tif_path in tif_info:
-        tif_id = get_tif_id(tif_name, sate_type)
-        group_dict[sate_type][tif_id].append((tif_name, tif_path))
-
-    # 第三步：整理分组结果（匹配原始返回格式）
-    tif_satetypes = []
-    tifs = []
-    tifs_path = []
-    for sate_type, id_groups in group_dict.items():
-        for tif_id, id_group in id_groups.items():
-            # 提取同一ID下的所有影像名称和路径
-            group_names = [item[0] for item in id_group]
-            group_paths = [item[1] for item in id_group]
-            tif_satetypes.append(sate_type)
-            tifs.append(group_names)
-            tifs_path.append(group_paths)
-
-    return tif_satetypes, tifs, tifs_path
-
-
-def get_message(tif_name: str, sate_type: str) -> list:
+        tif_name = os.path.splitext(os.path.basename(tif_path))[0]  # 不带后缀的文件名（如 "GF1_20230101_xxx"）
+        parts = tuple(tif_name.split("_"))
+        sate_type = parts[0]  # 卫星类型：按"_"分割，取第一部分
+        rec = TifRec(tif_name, parts, tif_path, sate_type, get_tif_id(tif_name, sate_type, parts))
+        group_dict.setdefault((sate_type, rec.tif_id), []).append(rec)
+
+    # 第三步：整理分组结果
+    tif_satetypes = [sate_type for sate_type, _ in group_dict]
+    tif_groups = list(group_dict.values())
+    return tif_satetypes, tif_groups
+
+
+# 各卫星元信息的解析规则（时相、传感器分两步提取，文件名异常时已提取的部分保留）
+# 入参：parts为按"_"分割后的文件名，dash_last为最后一个"-"之后的部分
+def _time_p4(parts: tuple[str, ...]) -> str:
+    return parts[4]
+
+
+def _time_p4_date(parts: tuple[str, ...]) -> str:
+    return parts[4][:8]  # 时间取前8位（YYYYMMDD）
+
+
+def _time_p1(parts: tuple[str, ...]) -> str:
+    return parts[1]
+
+
+def _time_th01(parts: tuple[str, ...]) -> str:
+    return parts[1][1:9]  # 时间取第2-9位（如 "T20230101" → "20230101"）
+
+
+# 传感器前缀提取：返回查表用的键（各卫星前缀所在位置不同）
+def _prefix_dash(parts: tuple[str, ...], dash_last: str) -> str:
+    return dash_last[0]  # 最后一个"-"之后的首字母
+
+
+def _prefix_p5(parts: tuple[str, ...], dash_last: str) -> str:
+    return parts[5][0]
+
+
+def _prefix_p1(parts: tuple[str, ...], dash_last: str) -> str:
+    return parts[1][0]
+
+
+def _prefix_th01(parts: tuple[str, ...], dash_last: str) -> str | tuple[str, str]:
+    # 天绘一号全色还需按角度编号区分前/下/后视，键为(前缀, 角度编号)
+    sensor_prefix = parts[3][0]
+    angle = parts[4]
+    return (sensor_prefix, angle) if sensor_prefix == "S" else sensor_prefix
+
+
+# 传感器前缀 → (传感器类型, 传感器角度, 分辨率)
+_GF1_SENSORS = {"M": (MS, "-", "8m"), "P": (PAN, "-", "2m")}  # GF1/GF6：多光谱8m、全色2m
+_ZY3_PREFIX = {  # 资源三号：全色后视/前视3m、全色下视2m、多光谱下视8m
+    "b": (PAN, BACK, "3m"), "f": (PAN, FRONT, "3m"),
+    "n": (PAN, DOWN, "2m"), "m": (MS, DOWN, "8m"),
+}
+_SV_PREFIX = {"M": (MS, "-", "2m"), "P": (PAN, "-", "0.5m")}  # SV1-03/SV-2：多光谱2m、全色0.5m
+_TH01_PREFIX = {  # 天绘一号：全色前/下/后视5m、高分辨下视2m、多光谱下视8m
+    ("S", "1"): (PAN, FRONT, "5m"), ("S", "2"): (PAN, DOWN, "5m"), ("S", "3"): (PAN, BACK, "5m"),
+    "G": (HR, DOWN, "2m"), "D": (MS, DOWN, "8m"),
+}
+_UNKNOWN_SENSOR = ("", "-", "")  # 前缀无法识别时的默认值
+
+# 卫星类型 → (时相解析函数, 前缀提取函数, 前缀→传感器信息表)（模块加载时建好，查表代替if/elif链）
+_SENSOR_TABLE = {
+    "GF1": (_time_p4, _prefix_dash, _GF1_SENSORS),
+    "GF6": (_time_p4, _prefix_dash, _GF1_SENSORS),
+    "GF2": (_time_p4, _prefix_dash, {"M": (MS, "-", "4m"), "P": (PAN, "-", "1m")}),
+    "GF7": (_time_p4_date, _prefix_p5, {"M": (MS, BACK, "3.2m"), "B": (PAN, BACK, "0.8m"), "F": (PAN, FRONT, "0.8m")}),
+    "zy303a": (_time_p4_date, _prefix_p1, _ZY3_PREFIX),
+    "zy302a": (_time_p4_date, _prefix_p1, _ZY3_PREFIX),
+    "ZY1": (_time_p4, _prefix_dash, {"M": (MS, "-", "10m"), "P": (PAN, "-", "2.5m")}),
+    "SV1-03": (_time_p1, _prefix_dash, _SV_PREFIX),
+    "SV-2": (_time_p1, _prefix_dash, _SV_PREFIX),
+    "TH01-01": (_time_th01, _prefix_th01, _TH01_PREFIX),
+    "TH01-02": (_time_th01, _prefix_th01, _TH01_PREFIX),
+    "TH01-03": (_time_th01, _prefix_th01, _TH01_PREFIX),
+    "TH01-04": (_time_th01, _prefix_th01, _TH01_PREFIX),
+}
+
+
+def get_message(parts: tuple[str, ...], tif_name: str, sate_type: str) -> list:
     """
     提取单张影像的元信息（影像型号、时相、传感器等，严格保留原始逻辑）
     参数：
+        parts: 按"_"分割后的文件名（preprocess_tif中已分割，直接复用）
         tif_name: 不带后缀的影像文件名
         sate_type: 卫星类型
     返回：
         元信息列表（顺序：影像型号、卫星类型、影像时相、传感器类型、传感器角度、分辨率）
     """
+    # 缓存中存不可变元组，每次返回新列表，调用方拼接/修改不会污染缓存
+    return list(_message_fields(parts, tif_name, sate_type))
+
+
+@lru_cache(maxsize=4096)
+def _message_fields(parts: tuple[str, ...], tif_name: str, sate_type: str) -> tuple[str, ...]:
+    """get_message的缓存实现：同名影像（如不同文件夹下的副本）只解析一次"""
     # 初始化默认值（避免None导致CSV空值，用空字符串占位）
     tif_id = tif_name
-    sate_type_ret = tif_name.split("_")[0] # 卫星类型：取文件名第一个下划线前的完整部分（还原原始逻辑）
+    sate_type_ret = parts[0]  # 卫星类型：取文件名第一个下划线前的完整部分（还原原始逻辑）
+    dash_last = tif_name.rpartition("-")[2]  # 最后一个"-"之后的部分（传感器前缀所在，从右侧查找，不生成列表）
     tif_time = ""
     sensor_type = ""
     sensor_angle = "-"  # 无角度信息默认用"-"
     resolution = ""
-    parts = tif_name.split("_")  # 预分割，减少重复计算
 
+    entry = _SENSOR_TABLE.get(sate_type)
     try:
-        if sate_type == "GF1":
-            tif_time = parts[4]
-            sensor_prefix = tif_name.split("-")[-1][0]
-            if sensor_prefix == "M":
-                sensor_type = "多光谱"
-                resolution = "8m"
-            elif sensor_prefix == "P":
-                sensor_type = "全色"
-                resolution = "2m"
-
-        elif sate_type == "GF2":
-            tif_time = parts[4]
-            sensor_prefix = tif_name.split("-")[-1][0]
-            if sensor_prefix == "M":
-                sensor_type = "多光谱"
-                resolution = "4m"
-            elif sensor_prefix == "P":
-                sensor_type = "全色"
-                resolution = "1m"
-
-        elif sate_type == "GF6":
-            tif_time = parts[4]
-            sensor_prefix = tif_name.split("-")[-1][0]
-            if sensor_prefix == "M":
-                sensor_type = "多光谱"
-                resolution = "8m"
-            elif sensor_prefix == "P":
-                sensor_type = "全色"
-                resolution = "2m"
-
-        elif sate_type == "GF7":
-            tif_time = parts[4][:8]  # 时间取前8位（YYYYMMDD）
-            sensor_prefix = parts[5][0]
-            if sensor_prefix == "M":
-                sensor_type = "多光谱"
-                sensor_angle = "后视"
-                resolution = "3.2m"
-            elif sensor_prefix == "B":
-                sensor_type = "全色"
-                sensor_angle = "后视"
-                resolution = "0.8m"
-            elif sensor_prefix == "F":
-                sensor_type = "全色"
-                sensor_angle = "前视"
-                resolution = "0.8m"
-
-        elif sate_type in ("zy303a","zy302a"):
-            tif_time = parts[4][:8]
-            sensor_prefix = parts[1][0]
-            if sensor_prefix == "b":
-                sensor_type = "全色"
-                sensor_angle = "后视"
-                resolution = "3m"
-            elif sensor_prefix == "f":
-                sensor_type = "全色"
-                sensor_angle = "前视"
-                resolution = "3m"
-            elif sensor_prefix == "n":
-                sensor_type = "全色"
-                sensor_angle = "下视"
-                resolution = "2m"
-            elif sensor_prefix == "m":
-                sensor_type = "多光谱"
-                sensor_angle = "下视"
-                resolution = "8m"
-
-        elif sate_type == "ZY1":
-            tif_time = parts[4]
-            sensor_prefix = tif_name.split("-")[-1][0]
-            if sensor_prefix == "M":
-                sensor_type = "多光谱"
-                resolution = "10m"
-            elif sensor_prefix == "P":
-                sensor_type = "全色"
-                resolution = "2.5m"
-
-        elif sate_type == "SV1-03":
-            tif_time = parts[1]
-            sensor_prefix = tif_name.split("-")[-1][0]
-            if sensor_prefix == "M":
-                sensor_type = "多光谱"
-                resolution = "2m"
-            elif sensor_prefix == "P":
-                sensor_type = "全色"
-                resolution = "0.5m"
-
-        elif sate_type == "SV-2":
-            tif_time = parts[1]
-            sensor_prefix = tif_name.split("-")[-1][0]
-            if sensor_prefix == "M":
-                sensor_type = "多光谱"
-                resolution = "2m"
-            elif sensor_prefix == "P":
-                sensor_type = "全色"
-                resolution = "0.5m"
-
-        elif sate_type in ("TH01-01","TH01-02","TH01-03","TH01-04"):
-            tif_time = parts[1][1:9]  # 时间取第2-9位（如 "T20230101" → "20230101"）
-            sensor_prefix = parts[3][0]
-            angle = parts[4]
-            if sensor_prefix == "S" and angle == "1":
-                sensor_type = "全色"
-                sensor_angle = "前视"
-                resolution = "5m"
-            elif sensor_prefix == "S" and angle == "2":
-                sensor_type = "全色"
-                sensor_angle = "下视"
-                resolution = "5m"
-            elif sensor_prefix == "S" and angle == "3":
-                sensor_type = "全色"
-                sensor_angle = "后视"
-                resolution = "5m"
-            elif sensor_prefix == "G":
-                sensor_type = "高分辨"
-                sensor_angle = "下视"
-                resolution = "2m"
-            elif sensor_prefix == "D":
-                sensor_type = "多光谱"
-                sensor_angle = "下视"
-                resolution = "8m"
-
+        if entry is not None:  # 未知卫星类型保留默认值
+            parse_time, sensor_prefix, prefix_map = entry
+            tif_time = parse_time(parts)
+            sensor_type, sensor_angle, resolution = prefix_map.get(sensor_prefix(parts, dash_last), _UNKNOWN_SENSOR)
     except IndexError:
         # 文件名格式异常时，返回默认值（避免程序崩溃）
-        print(f"[警告] 文件名 {tif_name} 格式异常，元信息提取不完整")
+        log.warning("[警告] 文件名 %s 格式异常，元信息提取不完整", tif_name)
+
+    return tif_id, sate_type_ret, tif_time, sensor_type, sensor_angle, resolution
+
 
-    return [tif_id, sate_type_ret, tif_time, sensor_type, sensor_angle, resolution]
+def _zero_count_kernel(block):
+    """单次遍历统计块内0值像素个数（比较与计数融合，不生成布尔掩膜；由numba编译后释放GIL，可与其他线程并行）"""
+    # 直接按行列遍历二维块，非连续内存的块也不会因ravel产生拷贝
+    rows, cols = block.shape
+    count = 0
+    for i in range(rows):
+        for j in range(cols):
+            if block[i, j] == 0:
+                count += 1
+    return count
 
 
-def get_quality(source_path: str, tif_path: str) -> list[bool]:
+@lru_cache(maxsize=None)
+def _get_zero_count():
     """
-    评估单张影像的质量（可打开性、完整性、RPC文件存在性，保留原始逻辑）
+    首次做0值统计时才导入numba并编译_zero_count_kernel（numba/llvmlite导入较慢，
+    不放在模块加载时，界面启动导入本模块时不付出这部分开销）
+    返回：
+        编译后的0值计数内核；未安装numba时返回None（0值统计退回numpy实现）
+    """
+    try:
+        from numba import njit
+    except ImportError:  # numba为可选依赖
+        return None
+    return njit(cache=True, nogil=True)(_zero_count_kernel)
+
+
+def _histogram_zero_count(band, dtype) -> int | None:
+    """
+    用GDAL单桶直方图在C层统计波段0值像素个数（不把像素搬进NumPy）
+    参数：
+        band: GDAL波段对象
+        dtype: 波段对应的NumPy数据类型（可为None）
+    返回：
+        0值像素个数；不适用或统计失败时返回None（由调用方回退到分块读取）
+    说明：
+        仅用于整型波段：桶区间[-0.5, 0.5)只落入0值；浮点波段该区间会混入非0小数。
+        有NoData值或掩膜时直方图会跳过这部分像素，与逐像素统计不等价，同样不适用
+    """
+    if dtype is None or not np.issubdtype(dtype, np.integer):
+        return None
+    if band.GetNoDataValue() is not None or band.GetMaskFlags() != gdal.GMF_ALL_VALID:
+        return None
+    try:
+        # approx_ok=0：统计全分辨率数据，不用金字塔采样，结果与逐像素统计一致
+        hist = band.GetHistogram(min=-0.5, max=0.5, buckets=1, include_out_of_range=0, approx_ok=0)
+    except Exception as e:
+        log.debug("[直方图统计失败] 回退分块读取：%s", e)
+        return None
+    return int(hist[0]) if hist else None
+
+
+def _sample_band(band):
+    """
+    选取用于0值统计的波段：有金字塔时取像素数不少于OVERVIEW_MIN_PIXELS的最小一级，否则返回原波段
+    （只能看到TIFF内部金字塔，外部.ovr/.rrd不会被打开；选中金字塔时0值占比为近似值，
+    是否损坏的判定不再是逐像素精确结果）
+    参数：
+        band: GDAL波段对象
+    返回：
+        金字塔波段或原波段
+    """
+    if not ZERO_RATIO_USE_OVERVIEWS:
+        return band
+    best = band
+    best_pixels = band.XSize * band.YSize
+    for k in range(band.GetOverviewCount()):
+        overview = band.GetOverview(k)
+        if overview is None:
+            continue
+        pixels = overview.XSize * overview.YSize
+        if OVERVIEW_MIN_PIXELS <= pixels < best_pixels:
+            best, best_pixels = overview, pixels
+    return best
+
+
+def _exceeds_zero_ratio(data, threshold: float) -> bool:
+    """
+    逐波段、按影像原生块流式统计0值像素，判断其占比是否超过阈值
+    （整型波段优先用GDAL直方图统计；其余按块读取，工作集仅为一个块，不整幅读入内存；
+    剩余像素已无法改变结论时提前结束；影像自带金字塔时在金字塔上采样统计，见_sample_band）
+    参数：
+        data: 已打开的GDAL数据集
+        threshold: 0值像素占比阈值（如0.3）
+    返回：
+        0值像素占比是否超过阈值
+    """
+    _zero_count = _get_zero_count()
+    # 各波段实际参与统计的波段（原波段或金字塔），总像素数按实际统计的尺寸计算
+    bands = [_sample_band(data.GetRasterBand(b + 1)) for b in range(data.RasterCount)]
+    scene_pixels = sum(band.XSize * band.YSize for band in bands)
+    if scene_pixels == 0:
+        return False
+
+    bad_limit = threshold * scene_pixels  # 坏像素超过该值即判定超标
+    good_limit = scene_pixels - bad_limit  # 正常像素达到该值即判定未超标
+    total_bad = 0
+    total_pixels = 0
+
+    for b, band in enumerate(bands):
+        x_size = band.XSize
+        y_size = band.YSize
+        dtype = gdal_array.GDALTypeCodeToNumericTypeCode(band.DataType)
+
+        # 优先用直方图在C层统计整个波段的0值像素
+        zero_count = _histogram_zero_count(band, dtype)
+        if zero_count is not None:
+            total_bad += zero_count
+            total_pixels += x_size * y_size
+            if total_bad > bad_limit:
+                return True
+            if total_pixels - total_bad >= good_limit:
+                return False
+            continue
+
+        block_x, block_y = band.GetBlockSize()  # 影像原生分块（瓦片/条带）大小
+        # 每个波段只分配一次块缓冲区和0值掩膜，整块读取时复用，避免逐块申请内存
+        block_buf = np.empty((block_y, block_x), dtype=dtype) if dtype is not None else None
+        zero_mask = np.empty((block_y, block_x), dtype=bool) if _zero_count is None else None
+        for y in range(0, y_size, block_y):
+            # 计算当前块的实际高度（最后一块可能不足block_y）
+            current_y_size = min(block_y, y_size - y)
+            for x in range(0, x_size, block_x):
+                current_x_size = min(block_x, x_size - x)
+                full_block = current_x_size == block_x and current_y_size == block_y
+
+                # 分块读取数据（仅读取当前块；整块直接写入复用的缓冲区）
+                data_block = band.ReadAsArray(x, y, current_x_size, current_y_size,
+                                              buf_obj=block_buf if full_block else None)
+                if data_block is None:
+                    raise ValueError(f"读取波段{b + 1}块({x},{y})失败")
+
+                # 累加坏像素和总像素数（有numba时用编译内核；否则比较结果写入复用的掩膜，不产生临时数组）
+                if _zero_count is not None:
+                    total_bad += _zero_count(data_block)
+                else:
+                    mask = np.equal(data_block, 0, out=zero_mask[:current_y_size, :current_x_size])
+                    total_bad += np.count_nonzero(mask)
+                total_pixels += data_block.size
+
+                # 提前结束：剩余像素已无法改变判定结果
+                if total_bad > bad_limit:
+                    return True
+                if total_pixels - total_bad >= good_limit:
+                    return False
+
+    return total_bad > bad_limit
+
+
+def evaluate_tif(rpc_index: tuple[dict[str, str], dict[str, str]], tif_path: str) -> list[bool] | None:
+    """
+    校验并评估单张影像（只打开一次数据集：先做有效性校验，再评估质量）
     参数：
-        source_path: 源文件夹路径（用于搜索RPC文件）
+        rpc_index: RPC/RPB文件名索引（build_rpc_index返回值）
         tif_path: 影像文件路径
     返回：
-        质量评估列表（顺序：是否能打开、是否损坏、光谱是否缺失、是否存在RPC）
+        质量评估列表（顺序：是否能打开、是否损坏、光谱是否缺失、是否存在RPC、是否存在RPB）；
+        非有效影像（无法打开、波段数为0、尺寸过小）返回None
     """
-    is_open = False  # 影像是否能正常打开
-    is_bad = False  # 影像是否损坏（0值像素占比>30%）
-    is_loss = False  # 光谱是否缺失（波段数<1）
-    exist_rpc = False  # 是否存在对应的RPC文件
-    data = None  # 初始化GDAL数据集，用于后续关闭
+    tif_name = os.path.basename(tif_path)
 
-    # 1. 评估影像可打开性和完整性
+    # 1. 打开影像（无法打开的文件直接判为无效，不做任何后续计算）
     try:
-        data = gdal.Open(tif_path)
-        if data is not None:
-            is_open = True
-            try:
-                # 获取影像尺寸
-                x_size = data.RasterXSize
-                y_size = data.RasterYSize
-                band_count = data.RasterCount
-
-                # 定义块大小（根据内存调整，如512x512）
-                block_size = 512
-                total_bad = 0
-                total_pixels = 0
-
-                # 分块遍历影像
-                for y in range(0, y_size, block_size):
-                    # 计算当前块的实际高度（最后一块可能不足block_size）
-                    current_y_size = min(block_size, y_size - y)
-                    for x in range(0, x_size, block_size):
-                        current_x_size = min(block_size, x_size - x)
-
-                        # 分块读取数据（仅读取当前块）
-                        data_block = data.ReadAsArray(x, y, current_x_size, current_y_size)
-                        if data_block is None:
-                            raise ValueError(f"读取块({x},{y})失败")
-
-                        # 累加坏像素和总像素数
-                        block_bad = np.sum(data_block == 0)
-                        block_total = np.prod(data_block.shape)
-                        total_bad += block_bad
-                        total_pixels += block_total
-
-                # 计算坏像素比例（避免除零）
-                is_bad = (total_bad / total_pixels) > 0.3 if total_pixels > 0 else False
-                # 光谱缺失判断（只要有1个波段即不缺失）
-                is_loss = band_count < 1
-            except Exception as e:
-                # 读取数据失败视为「光谱缺失」
-                is_loss = True
-                print(f"[警告] 读取影像 {Path(tif_path).name} 失败：{str(e)}")
-        else:
-            print(f"[警告] 影像 {Path(tif_path).name} 无法打开")
+        data = gdal.OpenEx(tif_path, gdal.OF_RASTER | gdal.OF_READONLY)
     except Exception as e:
-        # 新增：捕获GDAL打开文件时的意外异常（如文件被占用、格式错误）
-        print(f"[错误] 处理影像 {Path(tif_path).name} 时出错：{str(e)}")
-        is_loss = True  # 标记为光谱缺失
-    finally:
-        # 新增：显式关闭GDAL数据集，释放资源
-        if data is not None:
-            del data  # GDAL数据集无close()，通过del释放
-
-    # 2. 检查RPC文件（两种格式：{影像名}.rpc 或 {影像名}_rpc.txt，保留原始打印）
-    tif_stem = Path(tif_path).stem
-    source_dir = Path(source_path)
-    rpc_files = []
-    rpb_files = []  # 新增rpb文件列表
+        # 捕获其他异常（如文件损坏、IO错误），截取前50字符避免日志过长
+        log.warning("[无效影像] %s（校验失败：%s...）", tif_name, str(e)[:50])
+        return None
+    if data is None:
+        log.warning("[无效影像] %s（非影像文件，gdal无法识别）", tif_name)
+        return None
+
     try:
-        # 搜索所有可能的RPC文件
-        rpc_files = list(source_dir.rglob("*.rpc")) + list(source_dir.rglob("*_rpc.txt"))
-        rpb_files = list(source_dir.rglob("*.rpb"))  # 新增rpb文件搜索
-    except PermissionError as e:
-        print(f"[警告] 搜索RPC文件时权限不足：{str(e)}")
+        # 2. 校验有效性（原validate_tif_files逻辑），不通过则跳过像素统计
+        if data.RasterCount < 1:
+            log.warning("[无效影像] %s（空影像，波段数为0）", tif_name)
+            return None
+        if data.RasterXSize < 10 or data.RasterYSize < 10:
+            log.warning("[无效影像] %s（影像尺寸过小，宽/高<10像素，可能为损坏文件）", tif_name)
+            return None
+
+        # 3. 评估影像完整性（复用同一数据集）
+        try:
+            # 按波段、按原生块流式统计0值像素（坏像素占比>30%视为损坏）
+            is_bad = _exceeds_zero_ratio(data, 0.3)
+            is_loss = False
+        except Exception as e:
+            # 读取数据失败视为「光谱缺失」，损坏判定不再成立
+            is_bad, is_loss = False, True
+            log.warning("[警告] 读取影像 %s 失败：%s", tif_name, e)
+    finally:
+        # 所有出口统一释放GDAL数据集（GDAL推荐写法），让libtiff及时回收该文件的缓冲区
+        data = None
 
-    # 优化点1：仅在有RPC文件时才检查，无RPC文件直接提示
-    if not rpc_files:
-        print(f"[RPC匹配] 影像 {tif_stem}：未找到任何RPC文件")
-    else:
-        # 优化点2：遍历RPC文件，只打印匹配成功的日志，找到后立即退出
-        for rpc_file in rpc_files:
-            rpc_stem = rpc_file.stem
-            # 匹配规则：RPC文件名与影像名完全一致，或RPC名=影像名+"_rpc"
-            if rpc_stem == tif_stem or rpc_stem == f"{tif_stem}_rpc":
-                exist_rpc = True
-                print(f"[RPC匹配成功] 影像 {tif_stem} 找到对应RPC文件：{rpc_file.name}")
-                break  # 找到匹配后立即停止检查
-        # 优化点3：所有RPC文件都不匹配时，只打印一条总结日志
-        if not exist_rpc:
-            print(f"[RPC匹配失败] 影像 {tif_stem}：未找到匹配的RPC文件（共搜索到{len(rpc_files)}个RPC文件）")
-
-    # 新增：检查RPB文件
-    exist_rpb = False  # 新增rpb存在标记
-    if not rpb_files:
-        print(f"[RPB匹配] 影像 {tif_stem}：未找到任何RPB文件")
-    else:
-        for rpb_file in rpb_files:
-            rpb_stem = rpb_file.stem
-            if rpb_stem == tif_stem or rpb_stem == f"{tif_stem}_rpb":
-                exist_rpb = True
-                print(f"[RPB匹配成功] 影像 {tif_stem} 找到对应RPB文件：{rpb_file.name}")
-                break
-        if not exist_rpb:
-            print(f"[RPB匹配失败] 影像 {tif_stem}：未找到匹配的RPB文件（共搜索到{len(rpb_files)}个RPB文件）")
+    # 4. 检查RPC/RPB文件（查预建索引，O(1)匹配，不再逐影像遍历文件夹）
+    tif_stem = os.path.splitext(tif_name)[0]
+    rpc_files, rpb_files = rpc_index
+    rpc_path = rpc_files.get(tif_stem)
+    rpb_path = rpb_files.get(tif_stem)
+    exist_rpc = rpc_path is not None
+    exist_rpb = rpb_path is not None
+    log.debug("[RPC匹配] 影像 %s：RPC=%s，RPB=%s", tif_stem, rpc_path, rpb_path)
 
-    return [is_open, is_bad, is_loss, exist_rpc,exist_rpb]
+    return [True, is_bad, is_loss, exist_rpc, exist_rpb]
 
 
-def get_tif(tifs: list[str], tifs_path: list[str], tif_type: str, source_path: str) -> np.ndarray:
+def get_tif(recs: list[TifRec], tif_type: str, qualities: dict[str, list[bool]]) -> list[list]:
     """
     处理单组影像（同一ID）：合并元信息和质量信息（保留原始逻辑）
     参数：
-        tifs: 单组影像的名称列表
-        tifs_path: 单组影像的路径列表
+        recs: 单组影像的记录列表（preprocess_tif返回值中的一组）
         tif_type: 该组影像的卫星类型
-        source_path: 源文件夹路径
+        qualities: 有效影像路径 → 质量评估列表（evaluate_tif返回值）
     返回：
-        该组影像的完整信息数组（每行对应一张影像）
+        该组影像的完整信息列表（每行对应一张影像）
     """
     tifs_message = []
-    for tif_name, tif_path in zip(tifs, tifs_path):
-        # 提取元信息和质量信息
-        meta_msg = get_message(tif_name, tif_type)
-        quality_msg = get_quality(source_path, tif_path)
+    for rec in recs:
+        # 跳过校验未通过的无效影像
+        quality_msg = qualities.get(rec.path)
+        if quality_msg is None:
+            continue
+        # 提取元信息（复用预处理时的分割结果）
+        meta_msg = get_message(rec.parts, rec.stem, tif_type)
         # 合并信息（添加云占比字段，原始逻辑为"-"）
         full_msg = meta_msg + quality_msg + ["-"]
         tifs_message.append(full_msg)
 
-    # 转为numpy数组（匹配原始返回格式）
-    return np.array(tifs_message) if tifs_message else np.array([])
-
-
-def get_lack(tif_message: np.ndarray, tif_type: str) -> np.ndarray:
+    return tifs_message
+
+
+# 各卫星应有的传感器影像（缺失判断表）
+# 每项：(检查条件, 缺失记录的传感器类型, 角度, 分辨率)
+# 检查条件为传感器类型（str）时按类型判断是否出现；为(类型, 角度)元组时按组合判断
+_GF_PAN_MS_2M = ((PAN, PAN, "-", "2m"), (MS, MS, "-", "8m"))
+_TH01_SENSORS = (
+    ((PAN, FRONT), PAN, FRONT, "5m"),
+    ((PAN, DOWN), PAN, DOWN, "5m"),
+    ((PAN, BACK), PAN, BACK, "5m"),
+    (MS, MS, DOWN, "8m"),
+    (HR, HR, DOWN, "2m"),
+)
+_ZY3_SENSORS = (
+    ((PAN, BACK), PAN, BACK, "3m"),
+    ((PAN, FRONT), PAN, FRONT, "3m"),
+    ((PAN, DOWN), PAN, FRONT, "2m"),  # 原始逻辑：下视缺失时填FRONT（原始笔误保留）
+    (MS, MS, DOWN, "8m"),
+)
+_SV_SENSORS = ((PAN, PAN, "-", "0.5m"), (MS, MS, "-", "2m"))
+EXPECTED_SENSORS = {
+    "GF1": _GF_PAN_MS_2M,
+    "GF2": ((PAN, PAN, "-", "1m"), (MS, MS, "-", "4m")),
+    "GF6": _GF_PAN_MS_2M,
+    "GF7": (
+        ((PAN, BACK), PAN, BACK, "0.8m"),
+        ((PAN, FRONT), PAN, FRONT, "0.8m"),
+        (MS, MS, BACK, "3.2m"),
+    ),
+    "zy303a": _ZY3_SENSORS,
+    "zy302a": _ZY3_SENSORS,
+    "ZY1": ((PAN, PAN, "-", "2.5m"), (MS, MS, "-", "10m")),
+    "SV1-03": _SV_SENSORS,
+    "SV-2": _SV_SENSORS,
+    "TH01-01": _TH01_SENSORS,
+    "TH01-02": _TH01_SENSORS,
+    "TH01-03": _TH01_SENSORS,
+    "TH01-04": _TH01_SENSORS,
+}
+
+
+def get_lack(tifs_id: str, sensor_types: list[str], sensor_angles: list[str], tif_type: str) -> list[list[str]]:
     """
-    判断单组影像（同一ID）缺失的传感器类型（严格保留原始业务逻辑）
+    判断单组影像（同一ID）缺失的传感器类型（严格保留原始业务逻辑，规则见EXPECTED_SENSORS）
     参数：
-        tif_message: 单组影像的完整信息数组（get_tif返回值）
+        tifs_id: 该组影像的影像型号（原始逻辑：取第1行的ID）
+        sensor_types: 该组所有影像的传感器类型列表
+        sensor_angles: 该组所有影像的传感器角度列表（与sensor_types一一对应）
         tif_type: 该组影像的卫星类型
     返回：
-        缺失信息数组（每行对应一条缺失记录）
+        缺失信息列表（每行对应一条缺失记录）
     """
-    if tif_message.size == 0:
-        return np.array([])  # 空数组，避免后续vstack报错
+    # 已出现的「传感器类型-角度」组合及传感器类型（集合查找，每项检查O(1)）
+    present = set(zip(sensor_types, sensor_angles))
+    present_types = set(sensor_types)
 
     lack_list = []
-    # 提取该组核心信息（原始逻辑：取第1行的ID，所有行的传感器类型和角度）
-    tifs_id = tif_message[0, 0]
-    sensor_types = tif_message[:, 3]  # 传感器类型（第4列，0索引）
-    sensor_angles = tif_message[:, 4]  # 传感器角度（第5列，0索引）
-
-    if tif_type == "GF1":
-        if np.sum(sensor_types == "全色") == 0:
-            lack_list.append([tifs_id, "全色", "-", "2m"])
-        if np.sum(sensor_types == "多光谱") == 0:
-            lack_list.append([tifs_id, "多光谱", "-", "8m"])
-
-    elif tif_type == "GF2":
-        if np.sum(sensor_types == "全色") == 0:
-            lack_list.append([tifs_id, "全色", "-", "1m"])
-        if np.sum(sensor_types == "多光谱") == 0:
-            lack_list.append([tifs_id, "多光谱", "-", "4m"])
-
-    elif tif_type == "GF6":
-        if np.sum(sensor_types == "全色") == 0:
-            lack_list.append([tifs_id, "全色", "-", "2m"])
-        if np.sum(sensor_types == "多光谱") == 0:
-            lack_list.append([tifs_id, "多光谱", "-", "8m"])
-
-    elif tif_type == "GF7":
-        # 检查「全色-后视」「全色-前视」「多光谱-后视」
-        has_p_back = np.sum((sensor_types == "全色") & (sensor_angles == "后视")) == 0
-        has_p_front = np.sum((sensor_types == "全色") & (sensor_angles == "前视")) == 0
-        if has_p_back:
-            lack_list.append([tifs_id, "全色", "后视", "0.8m"])
-        if has_p_front:
-            lack_list.append([tifs_id, "全色", "前视", "0.8m"])
-        if np.sum(sensor_types == "多光谱") == 0:
-            lack_list.append([tifs_id, "多光谱", "后视", "3.2m"])
-
-    elif tif_type in ("zy303a","zy302a"):
-        # 原始逻辑：下视缺失时填"前视"，此处保留
-        has_p_back = np.sum((sensor_types == "全色") & (sensor_angles == "后视")) == 0
-        has_p_front = np.sum((sensor_types == "全色") & (sensor_angles == "前视")) == 0
-        has_p_down = np.sum((sensor_types == "全色") & (sensor_angles == "下视")) == 0
-        if has_p_back:
-            lack_list.append([tifs_id, "全色", "后视", "3m"])
-        if has_p_front:
-            lack_list.append([tifs_id, "全色", "前视", "3m"])
-        if has_p_down:
-            lack_list.append([tifs_id, "全色", "前视", "2m"])  # 原始笔误保留
-        if np.sum(sensor_types == "多光谱") == 0:
-            lack_list.append([tifs_id, "多光谱", "下视", "8m"])
-
-    elif tif_type == "ZY1":
-        if np.sum(sensor_types == "全色") == 0:
-            lack_list.append([tifs_id, "全色", "-", "2.5m"])
-        if np.sum(sensor_types == "多光谱") == 0:
-            lack_list.append([tifs_id, "多光谱", "-", "10m"])
-
-    elif tif_type in ("SV1-03", "SV-2"):
-        if np.sum(sensor_types == "全色") == 0:
-            lack_list.append([tifs_id, "全色", "-", "0.5m"])
-        if np.sum(sensor_types == "多光谱") == 0:
-            lack_list.append([tifs_id, "多光谱", "-", "2m"])
-
-    elif tif_type in ("TH01-01","TH01-02","TH01-03","TH01-04"):
-        has_p_front = np.sum((sensor_types == "全色") & (sensor_angles == "前视")) == 0
-        has_p_down = np.sum((sensor_types == "全色") & (sensor_angles == "下视")) == 0
-        has_p_back = np.sum((sensor_types == "全色") & (sensor_angles == "后视")) == 0
-        if has_p_front:
-            lack_list.append([tifs_id, "全色", "前视", "5m"])
-        if has_p_down:
-            lack_list.append([tifs_id, "全色", "下视", "5m"])
-        if has_p_back:
-            lack_list.append([tifs_id, "全色", "后视", "5m"])
-        if np.sum(sensor_types == "多光谱") == 0:
-            lack_list.append([tifs_id, "多光谱", "下视", "8m"])
-        if np.sum(sensor_types == "高分辨") == 0:
-            lack_list.append([tifs_id, "高分辨", "下视", "2m"])
-
-    # 转为numpy数组（匹配原始返回格式）
-    return np.array(lack_list).reshape(-1, 4) if lack_list else np.array([])
-
-
-def get_tifs(tifs: list[list[str]], tifs_path: list[list[str]], tif_types: list[str], source_path: str) -> tuple[np.ndarray, np.ndarray]:
+    for required, sensor_type, sensor_angle, resolution in EXPECTED_SENSORS.get(tif_type, ()):
+        found = required in present if isinstance(required, tuple) else required in present_types
+        if not found:
+            lack_list.append([tifs_id, sensor_type, sensor_angle, resolution])
+    return lack_list
+
+
+def _format_file_size(tif_path: str) -> str:
+    """获取文件大小，并按1024进制转换为最合适的单位（用于进度打印）"""
+    try:
+        file_size = os.stat(tif_path).st_size  # 获取字节数
+    except PermissionError:
+        return "无法获取（权限不足）"
+    except Exception as e:
+        return f"获取失败：{str(e)[:10]}"
+
+    if file_size >= 1024 ** 3:  # 1GB及以上
+        return f"{file_size / (1024 ** 3):.2f} GB"
+    elif file_size >= 1024 ** 2:  # 1MB至1GB之间
+        return f"{file_size / (1024 ** 2):.2f} MB"
+    else:  # 1MB以下，用KB
+        return f"{file_size / 1024:.2f} KB"
+
+
+def get_tifs(tif_groups: list[list[TifRec]], tif_types: list[str],
+             rpc_index: tuple[dict[str, str], dict[str, str]]) -> tuple[list[list], list[list[str]]]:
     """
     批量处理多组影像：整合所有组的信息和缺失记录（保留原始逻辑）
     参数：
-        tifs: 多组影像的名称列表（preprocess_tif返回值）
-        tifs_path: 多组影像的路径列表（preprocess_tif返回值）
+        tif_groups: 多组影像的记录列表（preprocess_tif返回值）
         tif_types: 多组影像的卫星类型列表（preprocess_tif返回值）
-        source_path: 源文件夹路径
+        rpc_index: RPC/RPB文件名索引（build_rpc_index返回值）
     返回：
-        所有影像的完整信息数组、所有缺失记录数组
+        所有影像的完整信息列表、所有缺失记录列表
     """
     all_messages = []
     all_lacks = []
+    all_paths = [rec.path for recs in tif_groups for rec in recs]
+    # 按所在文件夹排序后再提交：同一文件夹的影像连续打开，提高系统预读和GDAL块缓存命中率
+    all_paths.sort(key=lambda p: (os.path.dirname(p), os.path.basename(p)))
+    total = len(all_paths)
+
+    # 1. 并行校验并评估所有影像（每张影像只打开一次数据集，线程间互不共享）
+    qualities = {}
+    failed_count = 0
+    _get_zero_count()  # 在主线程先完成numba的导入，质量检查线程直接取缓存结果  # 评估过程出错（非校验不通过）的影像数
+    with ThreadPoolExecutor(max_workers=QUALITY_WORKERS) as executor:
+        futures = {executor.submit(evaluate_tif, rpc_index, tif_path): tif_path for tif_path in all_paths}
+        for done, future in enumerate(as_completed(futures), 1):
+            tif_path = futures[future]
+            if log.isEnabledFor(logging.DEBUG):  # 未开启DEBUG时不额外stat取文件大小
+                log.debug("[处理进度] 已完成第 %d/%d 张影像：%s（大小：%s）",
+                          done, total, os.path.basename(tif_path), _format_file_size(tif_path))
+            try:
+                qualities[tif_path] = future.result()
+            except Exception as e:
+                # 评估出错的影像没有质量信息，下方合并时只跳过这一张，同组其余影像照常输出
+                failed_count += 1
+                log.warning("[错误] 评估影像 %s 质量失败：%s", os.path.basename(tif_path), e)
 
-    # 遍历每组影像（新增try-except隔离单组异常）
-    for idx, (group_names, group_paths, sate_type) in enumerate(zip(tifs, tifs_path, tif_types), 1):
+    # 输出校验结果
+    valid_count = sum(quality is not None for quality in qualities.values())
+    invalid_count = total - valid_count - failed_count
+    log.info("\n【文件校验结果】有效TIF文件：%d 个，无效文件：%d 个，评估出错：%d 个",
+             valid_count, invalid_count, failed_count)
+    # 若所有文件均无效，终止程序（避免后续空处理）
+    if valid_count == 0:
+        raise ValueError("【无有效影像】所有搜索到的.tif/.tiff文件均为无效影像，请检查文件完整性")
+
+    # 2. 逐组合并元信息与质量信息（纯字符串处理，顺序执行）
+    for idx, (recs, sate_type) in enumerate(zip(tif_groups, tif_types), 1):
         try:
             # 处理单组影像（原有逻辑保留）
-            group_msg = get_tif(group_names, group_paths, sate_type, source_path)
-            group_lack = get_lack(group_msg, sate_type)
-
-            # 收集结果（过滤空数组，避免vstack报错）
-            if group_msg.size > 0:
-                all_messages.append(group_msg)
-            if group_lack.size > 0:
-                all_lacks.append(group_lack)
-            print(f"[处理成功] 第{idx}组影像（卫星类型：{sate_type}）处理完成")
+            group_msg = get_tif(recs, sate_type, qualities)
+
+            # 收集结果（直接追加行，避免逐组vstack复制）
+            if group_msg:
+                all_messages.extend(group_msg)
+                # 原始逻辑：取第1行的ID，所有行的传感器类型（第4列）和角度（第5列）
+                all_lacks.extend(get_lack(group_msg[0][0], [row[3] for row in group_msg],
+                                          [row[4] for row in group_msg], sate_type))
+            log.debug("[处理成功] 第%d组影像（卫星类型：%s）处理完成", idx, sate_type)
         except Exception as e:
             # 新增：捕获单组处理异常，跳过该组但继续后续处理
-            group_name_sample = group_names[0] if group_names else "未知组"
-            print(f"[错误] 第{idx}组影像（{group_name_sample}）处理失败，跳过该组：{str(e)}")
+            group_name_sample = recs[0].stem if recs else "未知组"
+            log.warning("[错误] 第%d组影像（%s）处理失败，跳过该组：%s", idx, group_name_sample, e)
+
+    return all_messages, all_lacks
 
-    # 合并所有组结果（匹配原始返回格式）
-    merged_msg = np.vstack(all_messages) if all_messages else np.array([])
-    merged_lack = np.vstack(all_lacks) if all_lacks else np.array([])
-    return merged_msg, merged_lack
 
+# 结果CSV列名
+MSG_COLUMNS = [
+    "影像型号", "卫星类型", "影像时相", "传感器类型", "传感器角度",
+    "分辨率", "是否能打开", "是否损坏", "光谱是否缺失", "是否存在rpc","是否存在rpb", "云占比"
+]
+LACK_COLUMNS = ["影像型号", "缺失传感器类型", "缺失传感器角度", "缺失影像分辨率"]
 
-def to_csv(tifs_message: np.ndarray, tifs_lack: np.ndarray, save_path: str) -> None:
+
+@lru_cache(maxsize=None)
+def _get_polars():
+    """首次写CSV时才导入polars（只有_write_csv用到，不拖慢界面启动）；未安装时返回None"""
+    try:
+        import polars
+    except ImportError:  # polars为可选依赖，未安装时结果CSV用标准库csv逐行写出
+        return None
+    return polars
+
+
+def _write_csv(csv_path: Path, columns: list[str], rows: list[list]) -> None:
+    """
+    写出CSV（utf-8-sig编码，Excel可直接打开中文）
+    已安装polars时由其在Rust层批量编码写出；否则用标准库csv逐行流式写出，内存占用不随行数增长
+    """
+    pl = _get_polars()
+    if pl is not None:
+        df = pl.DataFrame(rows, schema=columns, orient="row")
+        # polars布尔值写作true/false，转成True/False与csv标准库的输出保持一致
+        bool_columns = [name for name, dtype in df.schema.items() if dtype == pl.Boolean]
+        if bool_columns:
+            df = df.with_columns(pl.col(bool_columns).cast(pl.Utf8).str.to_titlecase())
+        # polars把空字符串写作""，csv标准库写作空字段：空字符串先转为null（null写出为空字段）
+        str_columns = [name for name, dtype in df.schema.items() if dtype == pl.Utf8]
+        if str_columns:
+            df = df.with_columns(pl.when(pl.col(name) != "").then(pl.col(name)).alias(name)
+                                 for name in str_columns)
+        df.write_csv(csv_path, include_bom=True)
+        return
+
+    with open(csv_path, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.writer(f, lineterminator="\n")
+        writer.writerow(columns)
+        writer.writerows(rows)
+
+
+def to_csv(tifs_message: list[list], tifs_lack: list[list[str]], save_path: str) -> None:
     """
     将影像信息和缺失记录保存为CSV（保留原始格式，支持中文编码）
     参数：
-        tifs_message: 所有影像的完整信息数组
-        tifs_lack: 所有缺失记录数组
+        tifs_message: 所有影像的完整信息列表（每行一张影像）
+        tifs_lack: 所有缺失记录列表（每行一条缺失记录）
         save_path: 保存文件夹路径
     """
     save_dir = Path(save_path)
@@ -610,175 +870,121 @@ def to_csv(tifs_message: np.ndarray, tifs_lack: np.ndarray, save_path: str) -> N
         raise RuntimeError(f"[错误] 创建保存文件夹 {save_dir} 失败：{str(e)}") from e
 
     # 1. 保存影像信息CSV
-    if tifs_message.size > 0:
-        msg_columns = [
-            "影像型号", "卫星类型", "影像时相", "传感器类型", "传感器角度",
-            "分辨率", "是否能打开", "是否损坏", "光谱是否缺失", "是否存在rpc","是否存在rpb", "云占比"
-        ]
-        msg_df = pd.DataFrame(tifs_message, columns=msg_columns)
+    if tifs_message:
         msg_csv_path = save_dir / "message.csv"
         try:
-            msg_df.to_csv(msg_csv_path, index=False, encoding="utf-8-sig")
-            print(f"[保存成功] 影像信息已保存至：{msg_csv_path}")
+            # 质量列本身就是bool，按True/False原样写出
+            _write_csv(msg_csv_path, MSG_COLUMNS, tifs_message)
+            log.info("[保存成功] 影像信息已保存至：%s", msg_csv_path)
         except PermissionError as e:
             # 新增：捕获保存文件权限不足
-            print(f"[错误] 保存影像信息失败（{msg_csv_path}）：无写入权限，请检查文件是否被占用或文件夹权限")
+            log.error("[错误] 保存影像信息失败（%s）：无写入权限，请检查文件是否被占用或文件夹权限", msg_csv_path)
         except IOError as e:
             # 新增：捕获磁盘满、文件损坏等IO错误
-            print(f"[错误] 保存影像信息失败（{msg_csv_path}）：{str(e)}（可能磁盘空间不足或文件损坏）")
+            log.error("[错误] 保存影像信息失败（%s）：%s（可能磁盘空间不足或文件损坏）", msg_csv_path, e)
         except Exception as e:
             # 新增：捕获其他意外异常
-            print(f"[错误] 保存影像信息失败（{msg_csv_path}）：{str(e)}")
+            log.error("[错误] 保存影像信息失败（%s）：%s", msg_csv_path, e)
     else:
-        print("[警告] 无影像信息可保存，不生成 message.csv")
+        log.warning("[警告] 无影像信息可保存，不生成 message.csv")
 
     # 2. 保存缺失记录CSV（仅当有缺失时）
-    if tifs_lack.size > 0:
-        lack_columns = ["影像型号", "缺失传感器类型", "缺失传感器角度", "缺失影像分辨率"]
-        lack_df = pd.DataFrame(tifs_lack, columns=lack_columns)
+    if tifs_lack:
         lack_csv_path = save_dir / "lack.csv"
         try:
-            lack_df.to_csv(lack_csv_path, index=False, encoding="utf-8-sig")
-            print(f"[保存成功] 缺失记录已保存至：{lack_csv_path}")
+            _write_csv(lack_csv_path, LACK_COLUMNS, tifs_lack)
+            log.info("[保存成功] 缺失记录已保存至：%s", lack_csv_path)
         except PermissionError as e:
-            print(f"[错误] 保存缺失记录失败（{lack_csv_path}）：无写入权限，请检查文件是否被占用或文件夹权限")
+            log.error("[错误] 保存缺失记录失败（%s）：无写入权限，请检查文件是否被占用或文件夹权限", lack_csv_path)
         except IOError as e:
-            print(f"[错误] 保存缺失记录失败（{lack_csv_path}）：{str(e)}（可能磁盘空间不足或文件损坏）")
+            log.error("[错误] 保存缺失记录失败（%s）：%s（可能磁盘空间不足或文件损坏）", lack_csv_path, e)
         except Exception as e:
-            print(f"[错误] 保存缺失记录失败（{lack_csv_path}）：{str(e)}")
+            log.error("[错误] 保存缺失记录失败（%s）：%s", lack_csv_path, e)
     else:
-        print("[提示] 无缺失影像，不生成 lack.csv")
+        log.info("[提示] 无缺失影像，不生成 lack.csv")
 
 
-def main(img_names: list[str], img_path: str) -> tuple[np.ndarray, np.ndarray]:
+def main(img_names: list[str], img_path: str,
+         rpc_index: tuple[dict[str, str], dict[str, str]] | None = None,
+         validate: bool = True) -> tuple[list[list], list[list[str]]]:
     """
     单影像/多影像处理入口（保留原始函数签名和逻辑）
+    注意：应一次传入整批影像，不要逐张调用——分组和get_lack的缺失判定
+    依赖同一ID的全部传感器影像出现在同一批次中
     参数：
         img_names: 单张/多张TIF文件路径列表
         img_path: 源文件夹路径（用于搜索RPC文件）
+        rpc_index: 预建的RPC/RPB文件名索引，为None时按img_path现建
+        validate: 是否检查img_names中的路径都存在（传入search_tif的结果时可关闭）
     返回：
-        该批影像的完整信息数组、缺失记录数组
+        该批影像的完整信息列表、缺失记录列表
     """
+    if rpc_index is None:
+        rpc_index = build_rpc_index(img_path)
+
     # 预处理（分组）→ 提取信息 → 返回结果
-    tif_types, tifs, tifs_path = preprocess_tif(img_names)
-    tifs_message, tifs_lack = get_tifs(tifs, tifs_path, tif_types, img_path)
+    tif_types, tif_groups = preprocess_tif(img_names, validate=validate)
+    tifs_message, tifs_lack = get_tifs(tif_groups, tif_types, rpc_index)
     return tifs_message, tifs_lack
 
 
-def validate_tif_files(tif_paths: list[str]) -> list[str]:
-    """校验TIF文件是否为有效影像，过滤无效文件"""
-    valid_tifs = []
-    invalid_tifs = []
-
-    for tif_path in tif_paths:
-        tif_file = Path(tif_path)
-        try:
-            # 1. 尝试用gdal打开文件（非影像文件会返回None）
-            data = gdal.Open(tif_path)
-            if data is None:
-                invalid_tifs.append(f"{tif_file.name}（非影像文件，gdal无法识别）")
-                continue
-
-            # 2. 校验影像是否有至少1个波段（排除空影像）
-            band_count = data.RasterCount
-            if band_count < 1:
-                invalid_tifs.append(f"{tif_file.name}（空影像，波段数为0）")
-                continue
-
-            # 3. 校验影像宽高是否合法（排除异常小的无效影像）
-            if data.RasterXSize < 10 or data.RasterYSize < 10:
-                invalid_tifs.append(f"{tif_file.name}（影像尺寸过小，宽/高<10像素，可能为损坏文件）")
-                continue
-
-            # 4. 所有校验通过，加入有效列表
-            valid_tifs.append(tif_path)
-
-        except Exception as e:
-            # 捕获其他异常（如文件损坏、IO错误）
-            invalid_tifs.append(f"{tif_file.name}（校验失败：{str(e)[:50]}...）")  # 截取前50字符避免日志过长
-
-    # 输出校验结果
-    print(f"\n【文件校验结果】有效TIF文件：{len(valid_tifs)} 个，无效文件：{len(invalid_tifs)} 个")
-    if invalid_tifs:
-        print("【无效文件列表】")
-        for idx, invalid in enumerate(invalid_tifs, 1):
-            print(f"  {idx}. {invalid}")
-
-    # 若所有文件均无效，终止程序（避免后续空处理）
-    if not valid_tifs:
-        raise ValueError("【无有效影像】所有搜索到的.tif/.tiff文件均为无效影像，请检查文件完整性")
-
-    return valid_tifs
+@contextmanager
+def _queued_logging():
+    """
+    运行期间把模块日志转入队列，由单独的监听线程统一写到标准输出
+    （质量检查线程只做入队，不争抢控制台输出锁，也不在热循环中逐条刷新；
+    汇总/保存结果等信息同样以INFO级别入队，与逐影像的告警按发生顺序输出）
+    """
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter("%(message)s"))
+    listener = QueueListener(log_queue, stream_handler)
+
+    log.addHandler(queue_handler)
+    propagate, log.propagate = log.propagate, False  # 避免再经根日志器重复输出
+    level = log.level
+    if not log.isEnabledFor(logging.INFO):  # 运行期间至少输出INFO（已开启DEBUG时保持不变）
+        log.setLevel(logging.INFO)
+    listener.start()
+    try:
+        yield
+    finally:
+        log.removeHandler(queue_handler)
+        log.propagate = propagate
+        log.setLevel(level)
+        listener.stop()  # 写完队列中剩余的日志后再返回
 
 
 # 影像检查运行主函数
 def Controller_check_main(img_path):
-    # 原始逻辑：逐个处理每张影像，再合并结果（严格保留）
-    try:
-          # 替换为你的影像文件夹路径
-        # 1. 搜索所有TIF文件
-        img_names = search_tif(img_path)
-
-        # 2. 校验文件是否为有效影像
-        valid_tif_paths = validate_tif_files(img_names)
-
-        # 3. 初始化结果容器
-        all_tifs_message = []
-        all_tifs_lack = []
-
-        # 4. 逐个处理每张影像（原始循环逻辑）
-        for idx, img_file in enumerate(valid_tif_paths, 1):  # 改为处理有效文件，避免重复处理无效文件
-            file_path = Path(img_file)
-            try:
-                file_size = file_path.stat().st_size  # 获取字节数
-                # 按1024进制转换为最合适的单位
-                if file_size >= 1024 ** 3:  # 1GB及以上
-                    file_size_str = f"{file_size / (1024 ** 3):.2f} GB"
-                elif file_size >= 1024 ** 2:  # 1MB至1GB之间
-                    file_size_str = f"{file_size / (1024 ** 2):.2f} MB"
-                else:  # 1MB以下，用KB
-                    file_size_str = f"{file_size / 1024:.2f} KB"
-            except PermissionError:
-                file_size_str = "无法获取（权限不足）"
-            except Exception as e:
-                file_size_str = f"获取失败：{str(e)[:10]}"
-
-            print(f"\n[处理进度] 正在处理第 {idx}/{len(valid_tif_paths)} 张影像：{Path(img_file).name}（大小：{file_size_str}）")
-            # 单张影像处理（传入单文件列表）
-            tif_msg, tif_lack = main([img_file], img_path)
-            # 收集结果（过滤空数组）
-            if tif_msg.size > 0:
-                all_tifs_message.append(tif_msg)
-            if tif_lack.size > 0:
-                all_tifs_lack.append(tif_lack)
-
-        # 5. 合并所有影像结果并保存
-        if all_tifs_message:
-            merged_all_msg = np.vstack(all_tifs_message)
-        else:
-            merged_all_msg = np.array([])
+    # 搜索 → 整批分组、校验并评估 → 保存（运行期间日志经队列统一输出）
+    with _queued_logging():
+        try:
+              # 替换为你的影像文件夹路径
+            # 1. 搜索所有TIF文件，同一次遍历建立RPC/RPB文件名索引（整个运行只扫描一次目录树）
+            img_names, rpc_index = search_source(img_path)
 
-        if all_tifs_lack:
-            merged_all_lack = np.vstack(all_tifs_lack)
-        else:
-            merged_all_lack = np.array([])
+            # 2. 一次性处理全部影像（校验与质量评估共用一次打开，无效影像自动剔除）
+            # search_tif刚遍历出的路径必然存在，不再逐个stat
+            all_tifs_message, all_tifs_lack = main(img_names, img_path, rpc_index, validate=False)
 
-        # 6. 保存CSV
-        to_csv(merged_all_msg, merged_all_lack, img_path)
-        print(f"\n[处理完成] 所有影像已处理完毕，结果保存至：{Path(img_path).absolute()}")
+            # 3. 保存CSV
+            to_csv(all_tifs_message, all_tifs_lack, img_path)
+            log.info("\n[处理完成] 所有影像已处理完毕，结果保存至：%s", Path(img_path).absolute())
 
-    # 新增：全局异常捕获，友好提示错误信息
-    except ValueError as e:
-        print(f"\n[终止错误-参数/路径问题] {str(e)}")
-    except PermissionError as e:
-        print(f"\n[终止错误-权限问题] {str(e)}")
-    except FileNotFoundError as e:
-        print(f"\n[终止错误-文件缺失] {str(e)}")
-    except Exception as e:
-        print(f"\n[终止错误-未知异常] {str(e)}")
-        # 可选：打印异常堆栈，便于调试（生产环境可注释）
-        # import traceback
-        # traceback.print_exc()
+        # 新增：全局异常捕获，友好提示错误信息
+        except ValueError as e:
+            log.error("\n[终止错误-参数/路径问题] %s", e)
+        except PermissionError as e:
+            log.error("\n[终止错误-权限问题] %s", e)
+        except FileNotFoundError as e:
+            log.error("\n[终止错误-文件缺失] %s", e)
+        except Exception as e:
+            log.error("\n[终止错误-未知异常] %s", e)
+            # 可选：打印异常堆栈，便于调试（生产环境可注释）
+            # import traceback
+            # traceback.print_exc()
 
 img_path = r"G:\lzy_IQaDS_system\lzy_IQaDS_system_test_data\data_8\TEST"
 # Controller_check_main(img_path)
@@ -1,11 +1,15 @@
 # coding:utf-8
+# 性能说明：本文件只负责界面构建和信号分发，没有数值计算循环，不使用Numba/Cython等JIT/编译加速
+# （JIT只会增加启动时的编译开销）。界面启动优化优先采用延迟初始化、缓存和减少布局重算；
+# 数值计算的加速（如Numba）仅用于Controller中的影像处理部分
+import functools
 import os
 import sys
 from pathlib import Path
 
 # 导入PyQt6基础模块
-from PyQt6.QtCore import Qt, pyqtSignal, QEasingCurve, QUrl, QSize
-from PyQt6.QtGui import QIcon, QDesktopServices, QPixmap
+from PyQt6.QtCore import Qt, pyqtSignal, QEasingCurve, QUrl, QSize, QTimer
+from PyQt6.QtGui import QIcon, QDesktopServices, QPixmap, QGuiApplication
 from PyQt6.QtWidgets import (QLabel, QHBoxLayout, QVBoxLayout,
                              QApplication, QFrame, QWidget)
 
@@ -29,29 +33,15 @@ from Controller_setting import Controller_setting
 # 该文件由QT Designer设计并通过pyuic6转换而来
 from UI_main import Ui_Form
 
+# QSS样式表缓存：主题名（light/dark）→ 样式表内容，文件不存在时为None
+# 每种主题的样式文件只读取一次，切换主题时直接复用
+_QSS_CACHE: dict[str, str | None] = {}
 
-class DesignerWidgetWrapper(QWidget):
-    """
-    包装QT Designer生成的UI组件，使其能正确集成到Fluent导航体系中
-
-    作用：
-    1. 保留Designer设计的布局和样式
-    2. 提供导航系统所需的唯一标识
-    3. 确保界面尺寸和布局策略正确继承
-    """
-
-    def __init__(self, designer_widget: QWidget, parent=None):
-        super().__init__(parent=parent)
-
-        # 复用Designer组件的布局（避免重新设计布局）
-        self.setLayout(designer_widget.layout())
 
-        # 继承原组件的大小策略（防止界面变形）
-        self.setSizePolicy(designer_widget.sizePolicy())
-
-        # 使用原组件的objectName作为导航标识
-        # 注意：这是Fluent导航系统识别界面的关键
-        self.setObjectName(designer_widget.objectName())
+@functools.cache
+def _logo_icon():
+    """窗口图标（只从文件解码一次，之后复用同一QIcon）"""
+    return QIcon(str(Path('./res/img/logo.png')))
 
 
 class StackedWidget(QFrame):
@@ -66,6 +56,12 @@ class StackedWidget(QFrame):
     # 页面切换时触发的信号，传递新页面的索引
     currentChanged = pyqtSignal(int)
 
+    # 切换动画参数（传给PopUpAniStackedWidget.setCurrentWidget的(位置参数, 关键字参数)）
+    # 平滑切换动画（300ms）
+    _ANIM_SMOOTH = ((), {'duration': 300})
+    # 弹出式动画（needPopOut=True, showNextWidgetDirectly=False，200ms，加速曲线）
+    _ANIM_POP = ((True, False, 200, QEasingCurve.Type.InQuad), {})
+
     def __init__(self, parent=None):
         super().__init__(parent=parent)
 
@@ -98,13 +94,8 @@ class StackedWidget(QFrame):
             widget: 要切换到的页面组件
             popOut: 是否使用弹出动画（默认使用平滑过渡）
         """
-        if not popOut:
-            # 平滑切换动画（300ms）
-            self.view.setCurrentWidget(widget, duration=300)
-        else:
-            # 弹出式动画（200ms，加速曲线）
-            self.view.setCurrentWidget(
-                widget, True, False, 200, QEasingCurve.Type.InQuad)
+        args, kwargs = self._ANIM_POP if popOut else self._ANIM_SMOOTH
+        self.view.setCurrentWidget(widget, *args, **kwargs)
 
     def setCurrentIndex(self, index, popOut=False):
         """根据索引切换到指定页面"""
@@ -128,14 +119,10 @@ class CustomTitleBar(TitleBar):
         # 设置标题栏高度
         self.setFixedHeight(48)
 
-        # 移除默认的窗口控制按钮（后续重新布局）
-        self.hBoxLayout.removeWidget(self.minBtn)
-        self.hBoxLayout.removeWidget(self.maxBtn)
-        self.hBoxLayout.removeWidget(self.closeBtn)
-
         # 1. 添加窗口图标
         self.iconLabel = QLabel(self)
         self.iconLabel.setFixedSize(18, 18)  # 图标大小
+        self._iconKey = None  # 当前显示图标的cacheKey，用于跳过重复设置
         self.hBoxLayout.insertSpacing(0, 20)  # 左侧留白
         # 将图标插入到布局中（左对齐、垂直居中）
         self.hBoxLayout.insertWidget(
@@ -152,7 +139,23 @@ class CustomTitleBar(TitleBar):
         # 监听窗口标题变化事件，同步更新
         self.window().windowTitleChanged.connect(self.setTitle)
 
-        # 3. 重新布局窗口控制按钮
+        # 3. 窗口控制按钮的重新布局推迟到首次显示时进行（见showEvent），
+        #    此前按钮留在父类hBoxLayout中的原位置
+        self.vBoxLayout = None
+
+    def showEvent(self, e):
+        """首次显示前完成窗口控制按钮的重新布局"""
+        if self.vBoxLayout is None:
+            self._initButtonLayout()
+        super().showEvent(e)
+
+    def _initButtonLayout(self):
+        """重新布局窗口控制按钮（最小化/最大化/关闭按钮居上排列）"""
+        # 移除默认的窗口控制按钮
+        self.hBoxLayout.removeWidget(self.minBtn)
+        self.hBoxLayout.removeWidget(self.maxBtn)
+        self.hBoxLayout.removeWidget(self.closeBtn)
+
         self.vBoxLayout = QVBoxLayout()
         self.buttonLayout = QHBoxLayout()
         self.buttonLayout.setSpacing(0)  # 按钮间无间距
@@ -171,12 +174,19 @@ class CustomTitleBar(TitleBar):
 
     def setTitle(self, title):
         """更新标题文本"""
+        # titleLabel由hBoxLayout管理：setText会更新sizeHint并通知布局，
+        # 布局按新文本宽度（含QSS内边距与字体）调整标签，无需再手动adjustSize
         self.titleLabel.setText(title)
-        self.titleLabel.adjustSize()  # 自动调整大小以适应文本
 
     def setIcon(self, icon):
-        """更新窗口图标"""
-        self.iconLabel.setPixmap(QIcon(icon).pixmap(18, 18))
+        """更新窗口图标（已是QIcon时不再包装；与当前图标相同时跳过重新渲染）"""
+        if not isinstance(icon, QIcon):
+            icon = QIcon(icon)
+        key = icon.cacheKey()
+        if key == self._iconKey:
+            return
+        self._iconKey = key
+        self.iconLabel.setPixmap(icon.pixmap(18, 18))
 
 
 class Window(FramelessWindow):
@@ -192,6 +202,8 @@ class Window(FramelessWindow):
     def __init__(self):
         super().__init__()
 
+        # 先设置窗口初始大小，之后创建的子组件直接按最终尺寸布局，避免按默认尺寸多算一遍
+        self.resize(900, 700)
 
         # 设置自定义标题栏
         self.setTitleBar(CustomTitleBar(self))
@@ -226,35 +238,51 @@ class Window(FramelessWindow):
         加载QT Designer生成的UI文件
 
         关键逻辑：
-        1. 使用成员变量保存临时容器，避免被Python垃圾回收
-        2. 从Designer的stackedWidget中提取页面
-        3. 用包装类处理页面，使其适配Fluent导航系统
+        1. 从Designer的stackedWidget中提取页面
+        2. 页面直接作为导航界面使用（页面的objectName即导航系统识别界面的唯一标识）
+        3. 页面移出后释放Designer的临时容器和stackedWidget
         """
-        # 创建临时容器保存Designer的UI（关键：用成员变量延长生命周期）
-        # 解决"RuntimeError: wrapped C/C++ object has been deleted"错误
-        self.designer_container = QWidget()
-        # 初始化Designer生成的UI类，将UI加载到临时容器
+        # 创建临时容器，初始化Designer生成的UI类，将UI加载到临时容器
+        designer_container = QWidget()
         self.designer_ui = Ui_Form()
-        self.designer_ui.setupUi(self.designer_container)
+        self.designer_ui.setupUi(designer_container)
+        stacked_widget = self.designer_ui.stackedWidget
 
         # 从Designer的stackedWidget中提取页面（根据实际UI调整索引）
         # 索引0：第一个页面
-        self.home_page = self.designer_ui.stackedWidget.widget(0)
+        home_page = stacked_widget.widget(0)
         # 索引1：第二个页面
-        self.check_page = self.designer_ui.stackedWidget.widget(1)
+        check_page = stacked_widget.widget(1)
         # 索引2：第三个页面
-        self.cloudDetect_page = self.designer_ui.stackedWidget.widget(2)
+        cloudDetect_page = stacked_widget.widget(2)
         # 索引3：第四个页面
-        self.select_page = self.designer_ui.stackedWidget.widget(3)
+        select_page = stacked_widget.widget(3)
         # 索引4：第五个页面
-        self.setting_page = self.designer_ui.stackedWidget.widget(4)
+        setting_page = stacked_widget.widget(4)
+
+        # 页面直接作为导航界面：从stackedWidget移出并改挂到主窗口下，不再随临时容器释放
+        # （Designer已为每个页面设置唯一的objectName，缺失时补上，保证导航路由键唯一）
+        pages = (
+            (home_page, 'home'),
+            (check_page, 'check'),
+            (cloudDetect_page, 'cloudDetect'),
+            (select_page, 'select'),
+            (setting_page, 'setting'),
+        )
+        for page, name in pages:
+            if not page.objectName():
+                page.setObjectName(name)
+            stacked_widget.removeWidget(page)
+            page.setParent(self)
+
+        self.home_interface = home_page
+        self.check_interface = check_page
+        self.cloudDetect_interface = cloudDetect_page
+        self.select_interface = select_page
+        self.setting_interface = setting_page
 
-        # 用包装类处理页面，使其适配Fluent导航系统
-        self.home_interface = DesignerWidgetWrapper(self.home_page, self)
-        self.check_interface = DesignerWidgetWrapper(self.check_page, self)
-        self.cloudDetect_interface = DesignerWidgetWrapper(self.cloudDetect_page, self)
-        self.select_interface = DesignerWidgetWrapper(self.select_page, self)
-        self.setting_interface = DesignerWidgetWrapper(self.setting_page, self)
+        # stackedWidget已空：连同临时容器一起释放，不在程序运行期间保留无用的组件
+        designer_container.deleteLater()
 
         # 初始化各个Controller
         Controller_home(self.designer_ui)
@@ -341,13 +369,10 @@ class Window(FramelessWindow):
         self.navigationBar.setCurrentItem(self.home_interface.objectName())
 
     def initWindow(self):
-        """初始化窗口基本设置"""
-        # 设置窗口初始大小
-        self.resize(900, 700)
-
+        """初始化窗口基本设置（窗口大小已在__init__开头设置）"""
         # 设置窗口图标（容错处理）
         try:
-            self.setWindowIcon(QIcon(str(Path('./res/img/logo.png'))))
+            self.setWindowIcon(_logo_icon())
         except:
             self.setWindowIcon(QIcon())  # 无图标时使用默认图标
 
@@ -358,12 +383,12 @@ class Window(FramelessWindow):
         self.titleBar.setAttribute(Qt.WidgetAttribute.WA_StyledBackground)
 
         # 窗口居中显示
-        desktop = QApplication.screens()[0].availableGeometry()
+        desktop = QGuiApplication.primaryScreen().availableGeometry()
         w, h = desktop.width(), desktop.height()
         self.move(w // 2 - self.width() // 2, h // 2 - self.height() // 2)
 
-        # 加载QSS样式表
-        self.setQss()
+        # 加载QSS样式表（推迟到事件循环首轮执行：窗口先显示，再整体应用样式）
+        QTimer.singleShot(0, self.setQss)
 
     def addSubInterface(self, interface, icon, text: str,
                         position=NavigationItemPosition.TOP, selectedIcon=None):
@@ -385,7 +410,7 @@ class Window(FramelessWindow):
             routeKey=interface.objectName(),  # 用界面的唯一标识作为路由键
             icon=icon,  # 图标
             text=text,  # 显示文本
-            onClick=lambda: self.switchTo(interface),  # 点击时切换到该界面
+            onClick=functools.partial(self.switchTo, interface),  # 点击时切换到该界面
             selectedIcon=selectedIcon,  # 选中状态的图标
             position=position  # 位置
         )
@@ -394,13 +419,24 @@ class Window(FramelessWindow):
         """加载QSS样式表，设置界面风格"""
         # 根据当前主题（亮色/暗色）加载对应的样式
         color = 'dark' if isDarkTheme() else 'light'
-        try:
-            # 尝试加载样式文件
-            with open(Path("res") / color / "demo.qss", encoding='utf-8') as f:
-                self.setStyleSheet(f.read())
-        except:
+        if color not in _QSS_CACHE:
+            try:
+                # 尝试加载样式文件
+                with open(Path("res") / color / "demo.qss", encoding='utf-8') as f:
+                    _QSS_CACHE[color] = f.read()
+            except OSError:
+                # 没有样式文件时记为None，之后不再重复尝试
+                _QSS_CACHE[color] = None
+
+        qss = _QSS_CACHE[color]
+        if qss:
             # 没有样式文件时不设置（不影响功能）
-            pass
+            # 样式表会重新polish整棵组件树，期间暂停重绘，完成后统一刷新一次
+            self.setUpdatesEnabled(False)
+            try:
+                self.setStyleSheet(qss)
+            finally:
+                self.setUpdatesEnabled(True)
 
     def switchTo(self, widget):
         """切换到指定界面"""